@@ -0,0 +1,169 @@
+import time
+from itertools import combinations
+
+import numpy as np
+
+from power_rankings import EVENT_KEY, EVENT_STATE_CACHE, OPR_RIDGE, build_match_design, generate_power_rankings
+
+# 🔹 Alliance Scoring Configuration
+ALLIANCE_COUNT = 8
+PICK_ROUNDS = 2              # Round 1 goes 1→8, round 2 snakes back 8→1
+WEIGHT_POWER = 0.5           # Sum of power ranking scores
+WEIGHT_POINTS = 0.5          # Expected alliance points, with diminishing returns per role
+ROLE_DECAY = np.array([1.0, 0.7, 0.4])  # Credit for the best, second and third robot in a shared role
+BARGE_PER_ROBOT_CAP = 12     # One deep cage climb per robot
+RECOMMENDATIONS_PER_PICK = 5
+
+# 🔹 Per-team auto and barge contributions
+# Least-squares solve on the alliance breakdown fields, the same way OPR is solved on scores.
+# Without match data, fall back to a third of the team's alliance averages.
+def estimate_components(power_rankings, matches=None, breakdown_fields=None):
+    teams = [team for team, _, _ in power_rankings]
+    auto = np.array([stats.get('avg_auto', 0) for _, _, stats in power_rankings], dtype=float) / 3
+    barge = np.array([stats.get('avg_barge', 0) for _, _, stats in power_rankings], dtype=float) / 3
+
+    design = build_match_design(matches or [], teams, breakdown_fields)
+    A = design['A']
+    if len(A):
+        played = A.sum(axis=0) > 0
+        solved = np.linalg.solve(A.T @ A + OPR_RIDGE * np.eye(len(teams)),
+                                 A.T @ np.stack([design['auto'], design['barge']], axis=1))
+        auto = np.where(played, solved[:, 0], auto)
+        barge = np.where(played, solved[:, 1], barge)
+
+    return np.maximum(auto, 0), np.clip(barge, 0, BARGE_PER_ROBOT_CAP)
+
+# 🔹 Score alliances of three teams
+# Barge climbs are independent, so capped per-robot barge points simply add up. Auto and teleop
+# compete for the same field resources, so within each of those roles the best robot counts fully
+# and the second and third are discounted by ROLE_DECAY: two robots with the same specialty are
+# worth less than two that cover different roles.
+def score_triples(triples, power, auto, teleop, barge):
+    def saturated(role):
+        return np.sort(role[triples], axis=1)[:, ::-1] @ ROLE_DECAY
+
+    points = saturated(auto) + saturated(teleop) + barge[triples].sum(axis=1)
+    return WEIGHT_POWER * power[triples].sum(axis=1) + WEIGHT_POINTS * points
+
+# 🔹 Alliance selection over power-ranking outputs
+# Every triple of teams is scored once with NumPy, then the draft looks up the best reachable triple.
+class AllianceSelector:
+    def __init__(self, power_rankings, matches=None, breakdown_fields=None):
+        self.teams = [team for team, _, _ in power_rankings]
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        power = np.array([score for _, score, _ in power_rankings], dtype=float)
+        opr = np.array([stats.get('OPR', 0) for _, _, stats in power_rankings], dtype=float)
+        auto, barge = estimate_components(power_rankings, matches, breakdown_fields)
+        teleop = np.maximum(opr - auto - barge, 0)  # Whatever of OPR isn't auto or barge
+
+        # Captain order follows the event standings, unranked teams go last in power order
+        standings = [stats.get('rank', 0) for _, _, stats in power_rankings]
+        self.captain_order = sorted(range(len(self.teams)),
+                                    key=lambda i: (standings[i] <= 0, standings[i], i))
+
+        # All triples as an index array (~82k rows for 80 teams) and their alliance scores
+        team_total = len(self.teams)
+        self.triples = np.fromiter((i for triple in combinations(range(team_total), 3) for i in triple),
+                                   dtype=np.int32).reshape(-1, 3)
+        self.scores = score_triples(self.triples, power, auto, teleop, barge)
+
+    # 🔹 Best achievable alliance score for each candidate pick (-inf if not pickable)
+    def pick_values(self, alliance, pickable):
+        members = [self.team_index[team] for team in alliance]
+        in_triple = np.zeros(len(self.teams), dtype=bool)
+        in_triple[members] = True
+
+        # Triples that contain the whole alliance and are otherwise made of pickable teams
+        allowed = pickable | in_triple
+        rows = (in_triple[self.triples].sum(axis=1) == len(members)) & allowed[self.triples].all(axis=1)
+        triples, scores = self.triples[rows], self.scores[rows]
+
+        # Credit each triple's score to the non-member teams in it (look-ahead for the next pick)
+        values = np.full(len(self.teams), -np.inf)
+        candidates = ~in_triple[triples]
+        np.maximum.at(values, triples[candidates], np.repeat(scores, candidates.sum(axis=1)))
+        values[~pickable] = -np.inf
+        return values
+
+    # 🔹 Simulate the serpentine draft
+    # alliances: picks already made (lists of team numbers, captain first), declined: teams that
+    # turned down an invitation and can no longer be picked (they may still become captains).
+    def simulate_draft(self, alliances=None, declined=()):
+        alliances = [list(a) for a in (alliances or [])] + [[] for _ in range(ALLIANCE_COUNT - len(alliances or []))]
+        available = np.ones(len(self.teams), dtype=bool)
+        for alliance in alliances:
+            available[[self.team_index[team] for team in alliance]] = False
+        declined_mask = np.zeros(len(self.teams), dtype=bool)
+        declined_mask[[self.team_index[team] for team in declined if team in self.team_index]] = True
+
+        picks = []
+        for pick_round in range(1, PICK_ROUNDS + 1):
+            order = range(ALLIANCE_COUNT) if pick_round % 2 else reversed(range(ALLIANCE_COUNT))
+            for a in order:
+                alliance = alliances[a]
+                if len(alliance) > pick_round:
+                    continue  # This pick was already made
+
+                # Highest remaining seed becomes captain when the alliance's turn comes
+                if not alliance:
+                    captain = next((i for i in self.captain_order if available[i]), None)
+                    if captain is None:
+                        return alliances, picks
+                    alliance.append(self.teams[captain])
+                    available[captain] = False
+
+                values = self.pick_values(alliance, available & ~declined_mask)
+                if not np.isfinite(values).any():
+                    return alliances, picks
+                ranked = np.argsort(-values)[:RECOMMENDATIONS_PER_PICK]
+                ranked = ranked[np.isfinite(values[ranked])]
+                pick = ranked[0]
+                alliance.append(self.teams[pick])
+                available[pick] = False
+                picks.append({
+                    'alliance': a + 1,
+                    'round': pick_round,
+                    'pick': self.teams[pick],
+                    'recommendations': [(self.teams[i], float(values[i])) for i in ranked]
+                })
+
+        return alliances, picks
+
+# 🔹 Print the simulated draft
+def print_draft(alliances, picks):
+    print("\n🤝 RECOMMENDED PICKS 🤝")
+    for pick in picks:
+        options = ", ".join(f"{team} ({value:.1f})" for team, value in pick['recommendations'])
+        print(f"Alliance {pick['alliance']} round {pick['round']}: Team {pick['pick']} | Options: {options}")
+    print("\n🏆 PROJECTED ALLIANCES 🏆")
+    for a, alliance in enumerate(alliances, 1):
+        print(f"{a}. " + " / ".join(f"Team {team}" for team in alliance))
+
+# 🔹 Interactive draft helper
+if __name__ == "__main__":
+    print(f"🚀 Loading {EVENT_KEY} rankings for alliance selection...")
+    rankings = generate_power_rankings(cache_state=True)
+    selector = AllianceSelector(rankings, EVENT_STATE_CACHE['matches'], EVENT_STATE_CACHE['breakdown_fields'])
+    alliances, declined = [], []
+
+    print("\n💡 Record real picks as 'pick <alliance> <team>' (captain first), declines as 'decline <team>'. Blank line quits.")
+    while True:
+        start = time.perf_counter()
+        projected, picks = selector.simulate_draft(alliances, declined)
+        print_draft(projected, picks)
+        print(f"⏱️ Draft simulated in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        command = input("draft> ").split()
+        if not command:
+            break
+        if command[-1] not in selector.team_index:
+            print(f"⚠️ Team {command[-1]} is not at this event")
+        elif command[0] == 'decline' and len(command) == 2:
+            declined.append(command[1])
+        elif command[0] == 'pick' and len(command) == 3 and command[1].isdigit() and \
+                1 <= int(command[1]) <= ALLIANCE_COUNT:
+            a = int(command[1]) - 1
+            alliances += [[] for _ in range(a + 1 - len(alliances))]
+            alliances[a].append(command[2])
+        else:
+            print("⚠️ Expected 'pick <alliance> <team>' or 'decline <team>'")
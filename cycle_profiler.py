@@ -0,0 +1,162 @@
+import cProfile
+import gc
+import io
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+# 🔹 Current resident set size in MB
+def current_rss_mb():
+    # /proc gives the live RSS on Linux, psapi on Windows; elsewhere fall back to the peak from getrusage
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if sys.platform == 'win32':
+        return windows_rss_mb()
+    import resource  # Unix only, so imported here rather than at module level
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024  # Bytes on macOS, KB on Linux
+
+# 🔹 Working set size on Windows through psapi (NaN if unavailable)
+def windows_rss_mb():
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + \
+                   [(name, ctypes.c_size_t) for name in [
+                       'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                       'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage']]
+
+    try:
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize / 1024 / 1024
+    except (AttributeError, OSError):
+        pass
+    return float('nan')
+
+# 🔹 Per-cycle profiling and memory budget tracking
+# Every cycle records RSS, traced Python memory, live object counts and any extra gauges to
+# memory_track.csv; every `profile_every` cycles a cProfile dump and a tracemalloc report are
+# written as well. Opt-in, since tracemalloc slows down allocation-heavy code.
+class CycleProfiler:
+    def __init__(self, output_dir, memory_budget_mb, profile_every=1, top_n=15, gauges=None):
+        self.output_dir = output_dir
+        self.memory_budget_mb = memory_budget_mb
+        self.profile_every = max(1, profile_every)
+        self.top_n = top_n
+        self.gauges = gauges or {}  # Name -> callable returning a number (e.g. open figures)
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        tracemalloc.start(10)
+        self.track_file = os.path.join(output_dir, 'memory_track.csv')
+        self.cycle = None
+        self.profiler = None
+        self.started_at = None
+        self.baseline_rss = None
+        self.previous_snapshot = None
+        self.previous_types = Counter()
+
+    # 🔹 Begin measuring a cycle
+    def start_cycle(self, cycle):
+        self.cycle = cycle
+        self.started_at = time.perf_counter()
+        self.profiler = None
+        if (cycle - 1) % self.profile_every == 0:  # Always profile the first cycle as a baseline
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    # 🔹 Finish the cycle: write artifacts, track memory and check the budget
+    def end_cycle(self):
+        if self.cycle is None:
+            return
+        elapsed = time.perf_counter() - self.started_at
+        prefix = os.path.join(self.output_dir, f'cycle_{self.cycle:04d}')
+
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(prefix + '.prof')
+            self.write_memory_report(prefix + '_memory.txt', elapsed)
+
+        self.track_memory(elapsed)
+        self.cycle = None
+
+    @contextmanager
+    def profile_cycle(self, cycle):
+        self.start_cycle(cycle)
+        try:
+            yield self
+        finally:
+            self.end_cycle()
+
+    # 🔹 Top functions, top allocations and growth since the last profiled cycle
+    def write_memory_report(self, path, elapsed):
+        # Leave out the profilers' own bookkeeping and import machinery
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ])
+        stats_text = io.StringIO()
+        pstats.Stats(self.profiler, stream=stats_text).sort_stats('cumulative').print_stats(self.top_n)
+
+        with open(path, 'w') as f:
+            f.write(f"Cycle {self.cycle} at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ({elapsed:.1f}s)\n")
+            f.write(f"RSS: {current_rss_mb():.1f} MB | Budget: {self.memory_budget_mb} MB\n\n")
+
+            f.write(f"Top {self.top_n} allocations by size:\n")
+            for stat in snapshot.statistics('lineno')[:self.top_n]:
+                f.write(f"  {stat}\n")
+
+            if self.previous_snapshot is not None:
+                f.write(f"\nTop {self.top_n} allocation changes since last profiled cycle:\n")
+                for stat in snapshot.compare_to(self.previous_snapshot, 'lineno')[:self.top_n]:
+                    f.write(f"  {stat}\n")
+
+            f.write(f"\nTop {self.top_n} object types by count (change since last profiled cycle):\n")
+            types = Counter(type(obj).__name__ for obj in gc.get_objects())
+            for name, count in types.most_common(self.top_n):
+                f.write(f"  {name}: {count} ({count - self.previous_types.get(name, 0):+d})\n")
+
+            f.write(f"\nTop {self.top_n} functions by cumulative time:\n")
+            f.write(stats_text.getvalue())
+
+        self.previous_snapshot = snapshot
+        self.previous_types = types
+        print(f"📈 Profile written to {path}")
+
+    # 🔹 Append this cycle's memory numbers and warn when past the budget
+    def track_memory(self, elapsed):
+        rss = current_rss_mb()
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        gauges = {name: gauge() for name, gauge in self.gauges.items()}
+        if self.baseline_rss is None:
+            self.baseline_rss = rss
+
+        new_file = not os.path.exists(self.track_file)
+        with open(self.track_file, 'a') as f:
+            if new_file:
+                f.write(",".join(["Cycle", "Timestamp", "Seconds", "RSS MB", "Traced MB", "Traced Peak MB",
+                                  "Objects"] + list(gauges)) + "\n")
+            f.write(",".join(str(v) for v in [
+                self.cycle, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), f"{elapsed:.2f}", f"{rss:.1f}",
+                f"{traced / 1024 / 1024:.1f}", f"{traced_peak / 1024 / 1024:.1f}", len(gc.get_objects())
+            ] + list(gauges.values())) + "\n")
+        tracemalloc.reset_peak()
+
+        print(f"📈 Memory: RSS {rss:.1f} MB ({rss - self.baseline_rss:+.1f} MB since first cycle), "
+              f"traced {traced / 1024 / 1024:.1f} MB")
+        if rss > self.memory_budget_mb:
+            print(f"⚠️ Memory budget exceeded: RSS {rss:.1f} MB > {self.memory_budget_mb} MB. "
+                  f"Check the latest report in {self.output_dir}")
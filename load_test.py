@@ -0,0 +1,83 @@
+import argparse
+import http.client
+import threading
+import time
+
+import numpy as np
+
+# 🔹 Paths hit by the simulated clients (a mix like tablets and dashboards)
+DEFAULT_PATHS = ['/rankings', '/rankings/top/8', '/rankings/top/24']
+
+# 🔹 One simulated client: reuse a keep-alive connection and revalidate with ETags
+def run_client(host, port, paths, deadline, latencies, results, lock):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    etags = {}
+    local_latencies = []
+    counts = {'ok': 0, 'not_modified': 0, 'errors': 0}
+    i = 0
+
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        headers = {'If-None-Match': etags[path]} if path in etags else {}
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            counts['errors'] += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        local_latencies.append(time.perf_counter() - start)
+
+        if response.status == 200:
+            counts['ok'] += 1
+            etags[path] = response.getheader('ETag')
+        elif response.status == 304:
+            counts['not_modified'] += 1
+        else:
+            counts['errors'] += 1
+
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        for key, value in counts.items():
+            results[key] += value
+
+# 🔹 Run the load test and print a summary
+def main():
+    parser = argparse.ArgumentParser(description='Load test the local rankings API server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--clients', type=int, default=200, help='Concurrent clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run')
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS)
+    args = parser.parse_args()
+
+    print(f"🚀 {args.clients} clients hitting http://{args.host}:{args.port} for {args.duration:.0f}s...")
+    latencies = []
+    results = {'ok': 0, 'not_modified': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    threads = [threading.Thread(target=run_client,
+                                args=(args.host, args.port, args.paths, deadline, latencies, results, lock))
+               for _ in range(args.clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = results['ok'] + results['not_modified']
+    print(f"✅ {total} responses in {elapsed:.1f}s → {total / elapsed:.0f} req/s")
+    print(f"   200: {results['ok']} | 304: {results['not_modified']} | Errors: {results['errors']}")
+    if latencies:
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        print(f"   Latency p50: {p50:.1f} ms | p95: {p95:.1f} ms | p99: {p99:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,17 @@
 import requests
 import numpy as np
 import matplotlib.pyplot as plt
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
+import json
+import multiprocessing
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
 import time  # Added import for sleep functionality
 import gspread  # Added for Google Sheets integration
 from oauth2client.service_account import ServiceAccountCredentials  # Added for Google Sheets auth
+from rankings_server import start_rankings_server
+from ranking_history import RankingHistory
 
 # Enable interactive mode for matplotlib
 plt.ion()
@@ -22,6 +28,37 @@ HEADERS = {"X-TBA-Auth-Key": TBA_AUTH_KEY}
 SHEETS_CREDENTIALS_FILE = 'frc-scouting-credentials.json'  # Update with your file name
 SPREADSHEET_NAME = f'FRC {CURRENT_SEASON} Power Rankings - {EVENT_KEY}'  # Name of your spreadsheet
 
+# 🔹 Season Index Configuration
+SEASON_INDEX_FILE = f'rankings/season_index_{CURRENT_SEASON}.json'
+SEASON_INDEX_MAX_AGE = 6 * 60 * 60  # Seconds before the index is checked for new events/teams
+SEASON_INDEX_LOOKAHEAD_DAYS = 14  # Events starting further out than this are not indexed yet
+
+# 🔹 Rankings API Server Configuration
+API_SERVER_ENABLED = False  # Serve the latest rankings as JSON to tablets and dashboards (no authentication)
+API_SERVER_HOST = '127.0.0.1'  # Set to '0.0.0.0' to let other devices on the network connect
+API_SERVER_PORT = 8080
+
+# 🔹 Ranking History Configuration
+HISTORY_LOG_DIR = f'rankings/history_{EVENT_KEY}'  # Append-only log of every ranking cycle
+
+# 🔹 Bootstrap Uncertainty Configuration
+BOOTSTRAP_ENABLED = False  # Resample qualification matches for score confidence intervals
+BOOTSTRAP_SAMPLES = 2000
+BOOTSTRAP_WORKERS = os.cpu_count() or 1
+BOOTSTRAP_BATCH_SIZE = 250  # Resamples solved together in one vectorized batch
+BOOTSTRAP_INTERVAL = (5, 95)  # Percentiles reported for each team's score
+# forkserver (or spawn on Windows) so the pool never forks a process running the API server thread
+BOOTSTRAP_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# 🔹 Profiling Configuration
+PROFILING_ENABLED = False  # cProfile + tracemalloc reports per cycle, for tracking down memory growth
+PROFILE_DIR = f'rankings/profiles_{EVENT_KEY}'
+PROFILE_EVERY = 1  # Write full profile/allocation reports every N cycles (memory is tracked every cycle)
+MEMORY_BUDGET_MB = 1024  # Warn when the process RSS grows past this
+
+# 🔹 Event data from the last generate_power_rankings(cache_state=True) run (reused by what-if queries)
+EVENT_STATE_CACHE = {}
+
 # 🔹 Connect to Google Sheets
 def connect_to_sheets():
     try:
@@ -147,16 +184,126 @@ def get_event_teams():
         exit()
     return teams
 
+# 🔹 Load the Season Index from Disk
+def load_season_index():
+    if os.path.exists(SEASON_INDEX_FILE):
+        try:
+            with open(SEASON_INDEX_FILE) as f:
+                index = json.load(f)
+            if index.get('season') == CURRENT_SEASON:
+                return index
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read season index, rebuilding: {e}")
+    
+    return {'season': CURRENT_SEASON, 'refreshed_at': None, 'events': {}, 'teams': {}}
+
+# 🔹 Save the Season Index to Disk
+def save_season_index(index):
+    save_dir = os.path.dirname(SEASON_INDEX_FILE)
+    if save_dir and not os.path.exists(save_dir):
+        os.makedirs(save_dir)
+    
+    # Write to a temp file first so a crash never leaves a half-written index
+    tmp_file = SEASON_INDEX_FILE + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(index, f)
+    os.replace(tmp_file, SEASON_INDEX_FILE)
+
+# 🔹 Build or Incrementally Refresh the Season Team/Event Index
+def refresh_season_index(index=None, force=False):
+    if index is None:
+        index = load_season_index()
+    
+    # Skip the refresh entirely if the index is recent enough
+    now = datetime.now()
+    refreshed_at = index.get('refreshed_at')
+    if not force and refreshed_at and \
+            (now - datetime.fromisoformat(refreshed_at)).total_seconds() < SEASON_INDEX_MAX_AGE:
+        return index
+    
+    season_events = fetch_data(f"events/{CURRENT_SEASON}/simple")
+    if season_events is None:
+        print("⚠️ Could not fetch season events. Using cached season index.")
+        return index
+    
+    today = now.date().isoformat()
+    lookahead = (now + timedelta(days=SEASON_INDEX_LOOKAHEAD_DAYS)).date().isoformat()
+    events = {}
+    fetched = 0
+    for event in season_events:
+        event_key = event.get('key')
+        cached = index['events'].get(event_key)
+        end_date = event.get('end_date') or '2099-01-01'
+        
+        # Far-future events can't be history yet and their team lists still change, pick them up later
+        if (event.get('start_date') or '2099-01-01') > lookahead:
+            continue
+        
+        # An event indexed after it ended has a final team list, reuse it
+        if cached and cached.get('indexed_at', '') > end_date:
+            events[event_key] = cached
+            continue
+        
+        team_keys = fetch_data(f"event/{event_key}/teams/keys")
+        if team_keys is None:
+            # Keep whatever we had and try again on the next refresh
+            if cached:
+                events[event_key] = cached
+            continue
+        
+        fetched += 1
+        events[event_key] = {
+            'name': event.get('name', event_key),
+            'start_date': event.get('start_date', ''),
+            'end_date': end_date,
+            'teams': team_keys,
+            'indexed_at': today
+        }
+    
+    # Rebuild the team -> events map, ordered by event start date
+    teams = {}
+    for event_key in sorted(events, key=lambda k: events[k]['start_date']):
+        for team_key in events[event_key]['teams']:
+            teams.setdefault(team_key, []).append(event_key)
+    
+    index['events'] = events
+    index['teams'] = teams
+    index['refreshed_at'] = now.isoformat()
+    save_season_index(index)
+    print(f"✅ Season index refreshed: {len(events)} events, {len(teams)} teams ({fetched} event team lists fetched)")
+    
+    return index
+
+# 🔹 Get a Team's Season Events (with dates) from the Season Index
+def get_team_events(season_index, team_key):
+    events = []
+    for event_key in season_index['teams'].get(team_key, []):
+        event = season_index['events'][event_key]
+        events.append({
+            'key': event_key,
+            'name': event['name'],
+            'start_date': event['start_date'],
+            'end_date': event['end_date']
+        })
+    return events
+
 # 🔹 Get Historical Data for a Team
-def get_team_history(team_key):
-    # Get team events from current season
-    season_events = fetch_data(f"team/{team_key}/events/{CURRENT_SEASON}") or []
+def get_team_history(team_key, season_index=None, exclude_events=None):
+    # Events being analyzed right now are not part of a team's history
+    exclude_events = set(exclude_events or [EVENT_KEY])
+    
+    # Get team events from current season, preferring the season index
+    # (teams it doesn't know, e.g. after a failed refresh, fall back to the per-team call)
+    if season_index is not None and team_key in season_index['teams']:
+        season_events = get_team_events(season_index, team_key)
+    else:
+        season_events = fetch_data(f"team/{team_key}/events/{CURRENT_SEASON}") or []
     
     # Sort events by date (most recent last)
     season_events.sort(key=lambda e: e.get('start_date', ''))
     
-    # Filter out future events and the current event
-    past_events = [e for e in season_events if e.get('key') != EVENT_KEY and 
+    # Filter out future events and the events being analyzed
+    past_events = [e for e in season_events if e.get('key') not in exclude_events and 
                   datetime.fromisoformat(e.get('end_date', '2099-01-01')) < datetime.now()]
     
     if not past_events:
@@ -316,6 +463,25 @@ def get_team_history(team_key):
     
     return metrics
 
+# 🔹 Get Historical Data for Every Team at a Set of Events
+def get_event_histories(event_keys, season_index=None):
+    if season_index is None:
+        season_index = refresh_season_index()
+    
+    # Collect the attending teams straight from the index, no per-team calls
+    team_keys = []
+    for event_key in event_keys:
+        event = season_index['events'].get(event_key)
+        event_teams = event['teams'] if event else (fetch_data(f"event/{event_key}/teams/keys") or [])
+        team_keys.extend(t for t in event_teams if t not in team_keys)
+    
+    histories = {}
+    for team_key in team_keys:
+        print(f"  Processing historical data for {team_key}...")
+        histories[team_key] = get_team_history(team_key, season_index, exclude_events=event_keys)
+    
+    return histories
+
 # 🔹 Calculate historical ranking score
 def calc_historical_score(history):
     if not history or not history.get('OPR'):
@@ -383,8 +549,42 @@ def calc_historical_score(history):
     
     return historical_score
 
+# 🔹 Calculate the ensemble ranking score
+# Works on scalars or NumPy arrays of teams/resamples, so the bootstrap uses the same formula
+def calc_ranking_score(opr, dpr, ccwm, score_avg, rank_percentile, win_rate,
+                       avg_auto, avg_barge, matches_played, historical_score):
+    # Normalize auto and barge to 0-100 scale
+    norm_auto = np.minimum(avg_auto / 15 * 100, 100)  # Scale assuming 15 is a "perfect" auto score
+    norm_barge = np.minimum(avg_barge / 15 * 100, 100)  # Scale assuming 15 is a "perfect" barge score
+    
+    # Enhanced Current Score calculation with the new metrics
+    current_score = (
+        0.45 * opr +                  # Heavy focus on offense
+        0.05 * (100 - dpr) +          # Less concern for defense
+        0.20 * ccwm +                 # Still considers contribution to winning
+        0.10 * score_avg +            # Match consistency
+        0.05 * rank_percentile +      # Rank consideration
+        0.10 * win_rate * 100 +       # Team's history of winning
+        0.025 * norm_auto +           # Autonomous contribution
+        0.025 * norm_barge            # Endgame contribution
+    )
+    
+    # Blend current score with historical (if matches exist, rely more on current)
+    # More sophisticated blending based on match count and data quality
+    match_confidence = np.minimum(matches_played / 8, 1.0)  # Max confidence after 8 matches
+    
+    # If we have good current data (4+ matches), weight it more heavily
+    blend_factor = np.where(matches_played >= 4,
+                            0.7 + (0.2 * match_confidence),   # 70-90% weight on current data
+                            0.3 + (0.4 * match_confidence))   # 30-70% weight on current data
+    
+    historical_factor = 1 - blend_factor  # Historical weight
+    
+    # Final score calculation with improved blending
+    return (blend_factor * current_score) + (historical_factor * historical_score)
+
 # 🔹 Main function to run the entire process
-def generate_power_rankings():
+def generate_power_rankings(bootstrap_samples=0, bootstrap_pool=None, cache_state=False):
     # Get teams
     teams = get_event_teams()
     team_stats = {team[3:]: {
@@ -395,10 +595,13 @@ def generate_power_rankings():
     } for team in teams}
     
     print("🔄 Fetching historical team data...")
+    # Team/event lookups come from the season index instead of one call per team
+    season_index = refresh_season_index()
+    
     # Get historical rankings for each team
     for team in teams:
         print(f"  Processing historical data for {team}...")
-        history = get_team_history(team)
+        history = get_team_history(team, season_index)
         if history:
             team_num = team[3:]
             historical_score = calc_historical_score(history)
@@ -459,61 +662,53 @@ def generate_power_rankings():
                     losses = record.get('losses', 0)
                     ties = record.get('ties', 0)
                     total = wins + losses + ties
+                    team_stats[team_num]['record'] = {"wins": wins, "losses": losses, "ties": ties}
                     if total > 0:
                         team_stats[team_num]['win_rate'] = (wins + 0.5 * ties) / total
     
     # 🔹 Analyze Match Performance including Auto and Barge
     print("🔄 Analyzing match performance with auto and barge points...")
     matches = fetch_data(f"event/{EVENT_KEY}/matches") or []
-    analyze_match_performance(matches, team_stats, teams)
+    breakdown_fields = analyze_match_performance(matches, team_stats, teams)
     
     # 🔹 Compute Final Power Rankings using Enhanced Ensemble Algorithm
     power_rankings = []
     for team, stats in team_stats.items():
-        matches = stats["matches_played"] if stats["matches_played"] > 0 else 1
-        score_avg = stats["score_avg"] / matches  # Average match contribution
+        matches_played = stats["matches_played"] if stats["matches_played"] > 0 else 1
+        score_avg = stats["score_avg"] / matches_played  # Average match contribution
         
         # Calculate rank percentile (1st place = 1.0, last place = 0.0)
         rank_percentile = 0.5  # Default middle rank
         if stats["rank"] > 0 and team_count > 0:
             rank_percentile = 1.0 - ((stats["rank"] - 1) / max(team_count - 1, 1))
+        stats["rank_percentile"] = rank_percentile
         
-        # Normalize auto and barge to 0-100 scale
-        norm_auto = min(stats["avg_auto"] / 15 * 100, 100)  # Scale assuming 15 is a "perfect" auto score
-        norm_barge = min(stats["avg_barge"] / 15 * 100, 100)  # Scale assuming 15 is a "perfect" barge score
-        
-        # Enhanced Current Score calculation with the new metrics
-        current_score = (
-            0.45 * stats["OPR"] +         # Heavy focus on offense
-            0.05 * (100 - stats["DPR"]) + # Less concern for defense
-            0.20 * stats["CCWM"] +        # Still considers contribution to winning
-            0.10 * score_avg +            # Match consistency
-            0.05 * rank_percentile +      # Rank consideration
-            0.10 * stats["win_rate"] * 100 + # Team's history of winning
-            0.025 * norm_auto +           # Autonomous contribution
-            0.025 * norm_barge            # Endgame contribution
+        ranking_score = calc_ranking_score(
+            stats["OPR"], stats["DPR"], stats["CCWM"], score_avg, rank_percentile,
+            stats["win_rate"], stats["avg_auto"], stats["avg_barge"],
+            stats["matches_played"], stats["historical_score"]
         )
         
-        # Blend current score with historical (if matches exist, rely more on current)
-        # More sophisticated blending based on match count and data quality
-        match_confidence = min(stats["matches_played"] / 8, 1.0)  # Max confidence after 8 matches
-        
-        # If we have good current data (4+ matches), weight it more heavily
-        if stats["matches_played"] >= 4:
-            blend_factor = 0.7 + (0.2 * match_confidence)  # 70-90% weight on current data
-        else:
-            blend_factor = 0.3 + (0.4 * match_confidence)  # 30-70% weight on current data
-        
-        historical_factor = 1 - blend_factor  # Historical weight
-        
-        # Final score calculation with improved blending
-        ranking_score = (blend_factor * current_score) + (historical_factor * stats["historical_score"])
-        
-        power_rankings.append((team, ranking_score, stats))
+        power_rankings.append((team, float(ranking_score), stats))
     
     # 🔹 Sort by Power Ranking Score
     power_rankings.sort(key=lambda x: x[1], reverse=True)
     
+    # 🔹 Cache the event data so what-if queries need no network calls
+    # (only on request, so the long-running loop doesn't hold on to the full match JSON)
+    if cache_state:
+        EVENT_STATE_CACHE.update({
+            'power_rankings': power_rankings,
+            'matches': matches,
+            'team_count': team_count,
+            'breakdown_fields': breakdown_fields
+        })
+    
+    # 🔹 Optionally attach bootstrap confidence intervals
+    if bootstrap_samples > 0:
+        print(f"🔄 Bootstrapping {bootstrap_samples} match resamples for score uncertainty...")
+        bootstrap_power_rankings(power_rankings, matches, breakdown_fields, bootstrap_samples, bootstrap_pool)
+    
     return power_rankings
 
 # 🔹 Visualization Function
@@ -627,7 +822,7 @@ def create_ranking_graph(power_rankings, top_n=10):
 # 🔹 Analyze Match Performance including Auto and Barge
 def analyze_match_performance(matches, team_stats, teams):
     if not matches:
-        return
+        return None
     
     # Set the exact field name for barge points as specified by the user
     barge_field_name = "endGameBargePoints"
@@ -719,19 +914,7 @@ def analyze_match_performance(matches, team_stats, teams):
                 auto_points = match['score_breakdown'][alliance].get(auto_field_name, 0)
                 
                 # Extract actual barge points using the specified field name
-                barge_points = match['score_breakdown'][alliance].get(barge_field_name, 0)
-                
-                # If value is not a number but a string status, try to convert
-                if isinstance(barge_points, str):
-                    try:
-                        if barge_points.lower() in ['yes', 'docked', 'engaged']:
-                            barge_points = 10  # Typical high score for successful endgame
-                        elif barge_points.lower() in ['partial', 'parked']:
-                            barge_points = 5   # Typical medium score
-                        else:
-                            barge_points = 0
-                    except:
-                        barge_points = 0
+                barge_points = parse_barge_points(match['score_breakdown'][alliance].get(barge_field_name, 0))
             
             for team_key in match["alliances"][alliance]["team_keys"]:
                 team_num = team_key[3:]
@@ -758,7 +941,144 @@ def analyze_match_performance(matches, team_stats, teams):
                   f"Auto avg: {team_stats[team_num]['avg_auto']:.1f}, " +
                   f"Barge avg: {team_stats[team_num]['avg_barge']:.1f}")
     
-    return
+    return auto_field_name, barge_field_name
+
+# 🔹 Convert a barge/endgame breakdown value to points
+def parse_barge_points(barge_points):
+    # If value is not a number but a string status, try to convert
+    if isinstance(barge_points, str):
+        if barge_points.lower() in ['yes', 'docked', 'engaged']:
+            return 10  # Typical high score for successful endgame
+        elif barge_points.lower() in ['partial', 'parked']:
+            return 5   # Typical medium score
+        return 0
+    return barge_points
+
+# 🔹 Ridge term for every OPR/DPR least-squares solve on a match design (bootstrap, what-if, alliance
+# components); keeps the solve defined for teams with no matches
+OPR_RIDGE = 1e-3
+
+# 🔹 Build alliance-level arrays from qualification matches for resampling
+def build_match_design(matches, team_nums, breakdown_fields):
+    auto_field_name, barge_field_name = breakdown_fields or ("autoPoints", "endGameBargePoints")
+    team_index = {team: i for i, team in enumerate(team_nums)}
+    
+    # Two rows per match (blue, red), same filters as analyze_match_performance
+    membership, scores, opp_scores, autos, barges = [], [], [], [], []
+    for match in matches:
+        if match["comp_level"] != "qm" or not match.get('score_breakdown'):
+            continue
+        for alliance, opponent in [("blue", "red"), ("red", "blue")]:
+            row = np.zeros(len(team_nums))
+            for team_key in match["alliances"][alliance]["team_keys"]:
+                if team_key[3:] in team_index:
+                    row[team_index[team_key[3:]]] = 1
+            breakdown = match['score_breakdown'].get(alliance, {})
+            membership.append(row)
+            scores.append(match["alliances"][alliance]["score"])
+            opp_scores.append(match["alliances"][opponent]["score"])
+            autos.append(breakdown.get(auto_field_name, 0))
+            barges.append(parse_barge_points(breakdown.get(barge_field_name, 0)))
+    
+    scores = np.array(scores, dtype=float)
+    opp_scores = np.array(opp_scores, dtype=float)
+    return {
+        'A': np.array(membership).reshape(len(membership), len(team_nums)),
+        'score': scores,
+        'opp_score': opp_scores,
+        'auto': np.array(autos, dtype=float),
+        'barge': np.array(barges, dtype=float),
+        'win': (scores > opp_scores) + 0.5 * (scores == opp_scores)  # Half credit for ties
+    }
+
+# 🔹 Score one batch of bootstrap resamples (runs inside a worker process)
+def run_bootstrap_batch(design, fixed, samples, seed):
+    rng = np.random.default_rng(seed)
+    A = design['A']
+    rows, team_total = A.shape
+    match_total = rows // 2
+    ridge = OPR_RIDGE * np.eye(team_total)
+    
+    # Per-row outer products, so each resample's normal matrix is one weighted sum
+    outer = (A[:, :, None] * A[:, None, :]).reshape(rows, team_total * team_total)
+    rhs_rows = (A[:, :, None] * np.stack([design['score'], design['opp_score']], axis=1)[:, None, :]).reshape(rows, -1)
+    per_team_rows = (A[:, :, None] * np.stack([design['score'], design['auto'], design['barge'], design['win']],
+                                              axis=1)[:, None, :]).reshape(rows, -1)
+    
+    batches = []
+    for start in range(0, samples, BOOTSTRAP_BATCH_SIZE):
+        batch = min(BOOTSTRAP_BATCH_SIZE, samples - start)
+        
+        # Resample whole matches with replacement; both alliances share a match's weight
+        match_weights = rng.multinomial(match_total, np.full(match_total, 1 / match_total), size=batch)
+        weights = np.repeat(match_weights.astype(float), 2, axis=1)
+        
+        # Weighted least squares for OPR (own score) and DPR (opponent score), all resamples at once
+        normal = (weights @ outer).reshape(batch, team_total, team_total) + ridge
+        solved = np.linalg.solve(normal, (weights @ rhs_rows).reshape(batch, team_total, 2))
+        played = weights @ A
+        has_played = played > 0
+        opr = np.where(has_played, solved[..., 0], fixed['OPR_default'])
+        dpr = np.where(has_played, solved[..., 1], fixed['DPR_default'])
+        ccwm = np.where(has_played, solved[..., 0] - solved[..., 1], fixed['CCWM_default'])
+        
+        # Per-team match averages
+        totals = (weights @ per_team_rows).reshape(batch, team_total, 4)
+        divisor = np.maximum(played, 1)
+        win_rate = np.where(has_played, totals[..., 3] / divisor, fixed['win_rate'])
+        
+        batches.append(calc_ranking_score(
+            opr, dpr, ccwm, totals[..., 0] / divisor, fixed['rank_percentile'], win_rate,
+            totals[..., 1] / divisor, totals[..., 2] / divisor, played, fixed['historical_score']
+        ))
+    
+    return np.concatenate(batches) if batches else np.empty((0, team_total))
+
+# 🔹 Start the long-lived worker pool for bootstrap resampling
+def start_bootstrap_pool(workers=BOOTSTRAP_WORKERS, start_method=BOOTSTRAP_START_METHOD):
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method))
+    # Start every worker now, so their imports don't land in the first ranking cycle
+    for future in [pool.submit(os.getpid) for _ in range(workers)]:
+        future.result()
+    print(f"✅ Bootstrap pool started: {workers} workers ({start_method})")
+    return pool
+
+# 🔹 Bootstrap confidence intervals and adjacent-pair ordering probabilities
+def bootstrap_power_rankings(power_rankings, matches, breakdown_fields, samples=BOOTSTRAP_SAMPLES,
+                             pool=None, workers=BOOTSTRAP_WORKERS, seed=None):
+    team_nums = [team for team, _, _ in power_rankings]
+    design = build_match_design(matches, team_nums, breakdown_fields)
+    if len(design['score']) == 0:
+        print("⚠️ No qualification matches to resample. Skipping bootstrap.")
+        return power_rankings
+    
+    # Inputs the resampling does not change (standings, history, fallbacks)
+    fixed = {key: np.array([stats.get(key, 0) for _, _, stats in power_rankings], dtype=float)
+             for key in ['rank_percentile', 'historical_score', 'win_rate']}
+    for key in ['OPR', 'DPR', 'CCWM']:
+        fixed[f'{key}_default'] = np.array([stats.get(f'{key}_default', 0) for _, _, stats in power_rankings],
+                                           dtype=float)
+    
+    # Split resamples across the pool's workers with independent random streams (inline without a pool)
+    workers = max(1, min(workers, samples // BOOTSTRAP_BATCH_SIZE)) if pool else 1
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    counts = [samples // workers + (1 if i < samples % workers else 0) for i in range(workers)]
+    if workers == 1:
+        scores = run_bootstrap_batch(design, fixed, counts[0], seeds[0])
+    else:
+        scores = np.concatenate(list(pool.map(run_bootstrap_batch, [design] * workers,
+                                              [fixed] * workers, counts, seeds)))
+    
+    # Percentile intervals per team, and how often each team stays ahead of the next one
+    low, high = np.percentile(scores, BOOTSTRAP_INTERVAL, axis=0)
+    order_confidence = (scores[:, :-1] > scores[:, 1:]).mean(axis=0)
+    for i, (team, score, stats) in enumerate(power_rankings):
+        stats['score_ci_low'] = float(low[i])
+        stats['score_ci_high'] = float(high[i])
+        if i < len(order_confidence):
+            stats['order_confidence'] = float(order_confidence[i])
+    
+    return power_rankings
 
 # 🔹 Run the program
 if __name__ == "__main__":
@@ -767,6 +1087,31 @@ if __name__ == "__main__":
     # Connect to Google Sheets
     spreadsheet = connect_to_sheets()
     
+    # Start the bootstrap worker pool before any server threads exist
+    bootstrap_pool = None
+    if BOOTSTRAP_ENABLED and BOOTSTRAP_WORKERS > 1:
+        bootstrap_pool = start_bootstrap_pool()
+    
+    # Start the local rankings API server
+    api_server = None
+    if API_SERVER_ENABLED:
+        try:
+            api_server = start_rankings_server(API_SERVER_HOST, API_SERVER_PORT)
+        except OSError as e:
+            print(f"⚠️ Could not start rankings API server: {e}")
+    
+    # Open the append-only ranking history log
+    history_log = RankingHistory(HISTORY_LOG_DIR)
+    print(f"✅ Ranking history log has {history_log.chunk_count} cycles in {HISTORY_LOG_DIR}")
+    
+    # Opt-in profiling of each update cycle
+    profiler = None
+    if PROFILING_ENABLED:
+        from cycle_profiler import CycleProfiler  # Only needed (and only imported) when profiling
+        profiler = CycleProfiler(PROFILE_DIR, MEMORY_BUDGET_MB, profile_every=PROFILE_EVERY,
+                                 gauges={'Open Figures': lambda: len(plt.get_fignums())})
+        print(f"📈 Profiling enabled, reports in {PROFILE_DIR}")
+    
     # Counter for determining when to create visualizations
     update_counter = 0
     
@@ -775,37 +1120,58 @@ if __name__ == "__main__":
             update_counter += 1
             current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             print(f"\n⏱️ Update #{update_counter} started at {current_time}")
+            # Profile the whole cycle, including cycles that raise (no-op unless profiling)
+            with profiler.profile_cycle(update_counter) if profiler else nullcontext():
+                # Generate rankings
+                rankings = generate_power_rankings(BOOTSTRAP_SAMPLES if BOOTSTRAP_ENABLED else 0, bootstrap_pool)
             
-            # Generate rankings
-            rankings = generate_power_rankings()
+                # Swap in the new API snapshot before the slower Sheets/graph updates
+                if api_server:
+                    try:
+                        api_server.publish(rankings)
+                    except Exception as e:
+                        print(f"⚠️ Error publishing rankings to API server, keeping previous snapshot: {e}")
             
-            # Print just the top 32 teams for quick reference
-            print("\n🏆 TOP 32 POWER RANKINGS 🏆")
-            for rank, (team, score, stats) in enumerate(rankings[:32], 1):
-                matches = stats["matches_played"] if stats["matches_played"] > 0 else 1
-                print(f"{rank}. Team {team} → Score: {score:.2f} | OPR: {stats['OPR']:.1f} | Matches: {stats['matches_played']}")
+                # Record this cycle in the ranking history log
+                movements = {}
+                try:
+                    history_log.append(rankings)
+                    movements = history_log.rank_movements()
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Error writing ranking history: {e}")
             
-            # Update Google Sheets
-            print("\n📊 Updating Google Sheets...")
-            update_google_sheets(spreadsheet, rankings)
+                # Print just the top 32 teams for quick reference
+                print("\n🏆 TOP 32 POWER RANKINGS 🏆")
+                for rank, (team, score, stats) in enumerate(rankings[:32], 1):
+                    matches = stats["matches_played"] if stats["matches_played"] > 0 else 1
+                    movement = movements.get(team)
+                    moved = f" | Since last match: {movement:+d}" if movement else ""
+                    print(f"{rank}. Team {team} → Score: {score:.2f} | OPR: {stats['OPR']:.1f} | Matches: {stats['matches_played']}{moved}")
+                    if 'score_ci_low' in stats:
+                        print(f"   {BOOTSTRAP_INTERVAL[0]}-{BOOTSTRAP_INTERVAL[1]}%: {stats['score_ci_low']:.2f} to {stats['score_ci_high']:.2f}" +
+                              (f" | Ahead of #{rank + 1}: {stats['order_confidence']*100:.0f}%" if 'order_confidence' in stats else ""))
             
-            # Create visualization and show (won't block due to interactive mode)
-            print("\n📊 Creating visualization and CSV...")
-            create_ranking_graph(rankings, top_n=10)
+                # Update Google Sheets
+                print("\n📊 Updating Google Sheets...")
+                update_google_sheets(spreadsheet, rankings)
             
-            # Every 5 updates, print full rankings
-            if update_counter % 5 == 0:
-                print("\n🏆 FULL POWER RANKINGS 🏆")
-                for rank, (team, score, stats) in enumerate(rankings[:38], 1):
-                    matches = stats["matches_played"] if stats["matches_played"] > 0 else 1
-                    match_avg = stats["score_avg"] / matches
+                # Create visualization and show (won't block due to interactive mode)
+                print("\n📊 Creating visualization and CSV...")
+                create_ranking_graph(rankings, top_n=10)
+            
+                # Every 5 updates, print full rankings
+                if update_counter % 5 == 0:
+                    print("\n🏆 FULL POWER RANKINGS 🏆")
+                    for rank, (team, score, stats) in enumerate(rankings[:38], 1):
+                        matches = stats["matches_played"] if stats["matches_played"] > 0 else 1
+                        match_avg = stats["score_avg"] / matches
                     
-                    print(f"{rank}. Team {team} → Score: {score:.2f}")
-                    print(f"   OPR: {stats['OPR']:.1f} | DPR: {stats['DPR']:.1f} | CCWM: {stats['CCWM']:.1f}")
-                    print(f"   Rank: {stats['rank']} | Win Rate: {stats['win_rate']*100:.1f}% | Match Avg: {match_avg:.1f}")
-                    print(f"   Avg Auto: {stats['avg_auto']:.1f} | Avg Barge: {stats['avg_barge']:.1f}")
-                    print(f"   Historical Score: {stats['historical_score']:.1f} | Matches: {stats['matches_played']}")
-                    print("-" * 50)
+                        print(f"{rank}. Team {team} → Score: {score:.2f}")
+                        print(f"   OPR: {stats['OPR']:.1f} | DPR: {stats['DPR']:.1f} | CCWM: {stats['CCWM']:.1f}")
+                        print(f"   Rank: {stats['rank']} | Win Rate: {stats['win_rate']*100:.1f}% | Match Avg: {match_avg:.1f}")
+                        print(f"   Avg Auto: {stats['avg_auto']:.1f} | Avg Barge: {stats['avg_barge']:.1f}")
+                        print(f"   Historical Score: {stats['historical_score']:.1f} | Matches: {stats['matches_played']}")
+                        print("-" * 50)
             
             print(f"✅ Update completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             print(f"⏳ Waiting for 3 minutes before next update...")
@@ -818,3 +1184,6 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"\n❌ Error occurred: {e}")
         raise
+    finally:
+        if bootstrap_pool:
+            bootstrap_pool.shutdown(cancel_futures=True)
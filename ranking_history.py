@@ -0,0 +1,101 @@
+import os
+import time
+
+import numpy as np
+
+# 🔹 Columns stored for every team in every cycle (power_rank and score come from the ranking tuple)
+HISTORY_FIELDS = [
+    'power_rank', 'score', 'OPR', 'DPR', 'CCWM', 'RP', 'score_avg', 'matches_played',
+    'rank', 'win_rate', 'avg_auto', 'avg_barge', 'historical_score'
+]
+
+# 🔹 Append-only time-series log of ranking cycles
+# Each cycle is one compressed columnar chunk (team ids + a float32 matrix of
+# HISTORY_FIELDS), so ~80 teams cost a few KB per cycle and a two-day event stays in the low MB.
+class RankingHistory:
+    def __init__(self, directory):
+        self.directory = directory
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.timestamps = np.empty(0)
+        self.teams = []            # Team ids (e.g. 254, 254B), in first-seen order
+        self.team_index = {}       # Team id -> column in the cube
+        self.cube = np.empty((0, 0, len(HISTORY_FIELDS)), dtype=np.float32)  # cycles x teams x fields
+        self.chunk_count = 0
+        self.load()
+
+    def chunk_files(self):
+        return sorted(f for f in os.listdir(self.directory) if f.startswith('cycle_') and f.endswith('.npz'))
+
+    # 🔹 Append one cycle of power rankings
+    def append(self, power_rankings, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        # Fixed-width strings so B-teams (e.g. 254B) are kept as-is
+        teams = np.array([str(team) for team, _, _ in power_rankings], dtype='U8')
+        values = np.array([
+            [rank, score] + [stats.get(field, 0) for field in HISTORY_FIELDS[2:]]
+            for rank, (_, score, stats) in enumerate(power_rankings, 1)
+        ], dtype=np.float32).reshape(len(power_rankings), len(HISTORY_FIELDS))
+
+        # Write to a temp file and rename, so readers never see a partial chunk
+        path = os.path.join(self.directory, f'cycle_{self.chunk_count + 1:06d}.npz')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, timestamp=np.float64(timestamp), teams=teams, values=values)
+        os.replace(tmp_path, path)
+
+        self.add_chunk(timestamp, teams, values)
+        return path
+
+    # 🔹 Load any chunks not yet in memory (e.g. written by another process)
+    def load(self):
+        for name in self.chunk_files()[self.chunk_count:]:
+            with np.load(os.path.join(self.directory, name)) as chunk:
+                self.add_chunk(float(chunk['timestamp']), chunk['teams'], chunk['values'])
+
+    def add_chunk(self, timestamp, teams, values):
+        # Grow the team axis for teams we have not seen before
+        new_teams = [str(t) for t in teams if str(t) not in self.team_index]
+        if new_teams:
+            for team in new_teams:
+                self.team_index[team] = len(self.teams)
+                self.teams.append(team)
+            pad = np.full((self.cube.shape[0], len(new_teams), len(HISTORY_FIELDS)), np.nan, dtype=np.float32)
+            self.cube = np.concatenate([self.cube, pad], axis=1)
+
+        row = np.full((1, len(self.teams), len(HISTORY_FIELDS)), np.nan, dtype=np.float32)
+        row[0, [self.team_index[str(t)] for t in teams]] = values
+        self.cube = np.concatenate([self.cube, row], axis=0)
+        self.timestamps = np.append(self.timestamps, timestamp)
+        self.chunk_count += 1
+
+    # 🔹 A team's value for one field across every cycle
+    def team_trajectory(self, team, field='score'):
+        team = str(team)
+        if team not in self.team_index:
+            return self.timestamps[:0], np.empty(0, dtype=np.float32)
+        series = self.cube[:, self.team_index[team], HISTORY_FIELDS.index(field)]
+        present = ~np.isnan(series)
+        return self.timestamps[present], series[present]
+
+    # 🔹 Power-rank change since before the team's latest match (positive = moved up)
+    def rank_movement(self, team):
+        team = str(team)
+        if team not in self.team_index or not len(self.timestamps):
+            return None
+        column = self.cube[:, self.team_index[team]]
+        played = column[:, HISTORY_FIELDS.index('matches_played')]
+        ranks = column[:, HISTORY_FIELDS.index('power_rank')]
+        if np.isnan(ranks[-1]):
+            return None
+
+        # Last cycle recorded before the team's current match count was reached
+        earlier = np.nonzero(played < played[-1])[0]
+        if not len(earlier):
+            return None
+        return int(ranks[earlier[-1]] - ranks[-1])
+
+    # 🔹 Rank movement for every team in the latest cycle
+    def rank_movements(self):
+        return {team: self.rank_movement(team) for team in self.teams}
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# 🔹 Stats published per team (the Google Sheets columns); everything else stays internal
+PUBLISHED_STATS = ['OPR', 'DPR', 'CCWM', 'win_rate', 'avg_auto', 'avg_barge', 'matches_played']
+OPTIONAL_STATS = ['score_ci_low', 'score_ci_high', 'order_confidence']  # Only with bootstrap enabled
+
+# 🔹 Build the JSON entry for one ranked team
+def ranking_entry(rank, team, score, stats):
+    published = {key: stats.get(key, 0) for key in PUBLISHED_STATS}
+    published['avg_score'] = stats.get('score_avg', 0) / max(stats.get('matches_played', 0), 1)
+    published.update({key: stats[key] for key in OPTIONAL_STATS if key in stats})
+    return {
+        'rank': rank,
+        'team': team,
+        'score': round(float(score), 2),
+        'stats': published
+    }
+
+# 🔹 JSON fallback: NumPy scalars (e.g. historical_score) serialize through their Python value
+def json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def encode_json(payload):
+    return json.dumps(payload, separators=(',', ':'), default=json_default).encode('utf-8')
+
+# 🔹 Tag a serialized response body with an ETag
+def tag_resource(body):
+    etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+    return body, etag
+
+# 🔹 Pre-serialized responses for one ranking cycle
+class RankingsSnapshot:
+    def __init__(self, power_rankings, updated_at=None):
+        self.updated_at = updated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        entries = [ranking_entry(rank, team, score, stats)
+                   for rank, (team, score, stats) in enumerate(power_rankings, 1)]
+        updated = encode_json(self.updated_at)
+
+        # Serialize each entry once; every list response is built from these bytes
+        entry_bodies = [encode_json(entry) for entry in entries]
+        joined = b','.join(entry_bodies)
+        offsets = [0]  # offsets[n] = end of the n-th entry in `joined`
+        end = -1  # No comma before the first entry
+        for body in entry_bodies:
+            end += len(body) + 1
+            offsets.append(end)
+
+        def list_body(n):
+            return (b'{"updated_at":' + updated + b',"count":' + str(n).encode() +
+                    b',"rankings":[' + joined[:offsets[n]] + b']}')
+
+        # Full list
+        self.full = tag_resource(list_body(len(entries)))
+
+        # Per-team detail, keyed by team number
+        self.teams = {entry['team']: tag_resource(b'{"updated_at":' + updated + b',' + body[1:])
+                      for entry, body in zip(entries, entry_bodies)}
+
+        # Every top-N prefix, so a request never has to slice or serialize
+        self.top = [tag_resource(list_body(n)) for n in range(len(entries) + 1)]
+
+# 🔹 Request Handler (reads only from the current snapshot)
+class RankingsRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so clients can reuse connections
+
+    def do_GET(self):
+        # Grab the snapshot once; a concurrent publish can't change it mid-request
+        snapshot = self.server.snapshot
+        if snapshot is None:
+            self.send_json_error(503, 'Rankings not available yet')
+            return
+
+        parts = [p for p in self.path.split('?', 1)[0].split('/') if p]
+        resource = None
+        if parts == ['rankings']:
+            resource = snapshot.full
+        elif len(parts) == 3 and parts[:2] == ['rankings', 'top'] and parts[2].isdigit():
+            resource = snapshot.top[min(int(parts[2]), len(snapshot.top) - 1)]
+        elif len(parts) == 2 and parts[0] == 'teams':
+            team = parts[1][3:] if parts[1].startswith('frc') else parts[1]
+            resource = snapshot.teams.get(team)
+            if resource is None:
+                self.send_json_error(404, f'Team {team} is not ranked')
+                return
+
+        if resource is None:
+            self.send_json_error(404, 'Use /rankings, /rankings/top/<n> or /teams/<team>')
+            return
+
+        body, etag = resource
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')  # Clients revalidate with the ETag
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json_error(self, status, message):
+        body = json.dumps({'error': message}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Hundreds of tablets polling would flood the console
+
+# 🔹 Threaded HTTP Server holding the latest snapshot
+class RankingsServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # Room for bursts of tablets reconnecting at once
+
+    def __init__(self, address):
+        super().__init__(address, RankingsRequestHandler)
+        self.snapshot = None
+
+    def publish(self, power_rankings):
+        # Serialize everything first, then swap the reference in one step
+        self.snapshot = RankingsSnapshot(power_rankings)
+
+# 🔹 Start the server on a background thread
+def start_rankings_server(host, port):
+    server = RankingsServer((host, port))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    print(f"✅ Rankings API listening on http://{host}:{port}/rankings")
+    return server
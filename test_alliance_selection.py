@@ -0,0 +1,31 @@
+import numpy as np
+
+from alliance_selection import AllianceSelector, BARGE_PER_ROBOT_CAP, estimate_components, score_triples
+
+# 🔹 Power-ranking tuple for a team with the given per-robot auto/teleop/barge points
+def ranked_team(team, auto, teleop, barge=0, score=50.0):
+    stats = {'OPR': auto + teleop + barge, 'avg_auto': auto * 3, 'avg_barge': barge * 3, 'rank': 0}
+    return (team, score, stats)
+
+def test_redundant_pair_scores_below_complementary_pair():
+    power = np.full(4, 50.0)
+    barge = np.zeros(4)
+    auto = np.array([10.0, 15.0, 15.0, 5.0])    # Captain, auto specialist x2, teleop specialist
+    teleop = np.array([10.0, 5.0, 5.0, 15.0])   # Every robot adds up to 20 points
+    redundant, complementary = score_triples(np.array([[0, 1, 2], [0, 1, 3]]), power, auto, teleop, barge)
+    assert redundant < complementary
+
+def test_second_pick_prefers_complementary_partner():
+    rankings = [
+        ranked_team('1', auto=15, teleop=5),     # Auto-heavy captain
+        ranked_team('2', auto=15, teleop=5),     # Same specialty as the captain
+        ranked_team('3', auto=5, teleop=15),     # Covers the captain's gap
+        ranked_team('4', auto=2, teleop=2),      # First pick already made
+    ]
+    selector = AllianceSelector(rankings)
+    values = selector.pick_values(['1', '4'], np.array([False, True, True, False]))
+    assert values[selector.team_index['3']] > values[selector.team_index['2']]
+
+def test_barge_is_capped_per_robot():
+    _, barge = estimate_components([ranked_team('1', auto=0, teleop=0, barge=20)])
+    assert barge[0] == BARGE_PER_ROBOT_CAP
@@ -0,0 +1,85 @@
+import copy
+
+import numpy as np
+
+from power_rankings import OPR_RIDGE, build_match_design
+from what_if import WhatIfEngine
+
+TEAMS = [str(team) for team in range(1, 10)]  # Team 9 has no played matches yet
+
+# 🔹 Qualification match in TBA format (scores of None leave it unplayed)
+def qual_match(number, red, blue, red_score=None, blue_score=None):
+    alliances = {color: {'team_keys': [f'frc{team}' for team in teams], 'score': -1}
+                 for color, teams in [('red', red), ('blue', blue)]}
+    breakdown = None
+    if red_score is not None:
+        alliances['red']['score'], alliances['blue']['score'] = red_score, blue_score
+        breakdown = {color: {'autoPoints': 10, 'endGameBargePoints': 6} for color in ['red', 'blue']}
+    return {'key': f'2025test_qm{number}', 'comp_level': 'qm', 'alliances': alliances, 'score_breakdown': breakdown}
+
+def event_matches():
+    rng = np.random.default_rng(7)
+    matches = []
+    for number in range(1, 13):
+        order = rng.permutation(8) + 1
+        matches.append(qual_match(number, order[:3], order[3:6], *rng.integers(40, 120, size=2).tolist()))
+    matches.append(qual_match(13, [1, 2, 3], [4, 5, 6]))
+    matches.append(qual_match(14, [9, 7, 8], [1, 4, 5]))
+    return matches
+
+# 🔹 OPR/DPR from one least-squares solve over every played match
+def full_solve(matches):
+    design = build_match_design(matches, TEAMS, None)
+    A = design['A']
+    rhs = np.stack([A.T @ design['score'], A.T @ design['opp_score']], axis=1)
+    return np.linalg.solve(A.T @ A + OPR_RIDGE * np.eye(len(TEAMS)), rhs), A.sum(axis=0) > 0
+
+def build_engine(matches):
+    base, _ = full_solve(matches)
+    power_rankings = []
+    for i, team in enumerate(TEAMS):
+        played = team != '9'
+        stats = {
+            'OPR': base[i, 0] if played else 30.0,  # Team 9 starts from its historical default
+            'DPR': base[i, 1] if played else 20.0,
+            'CCWM': base[i, 0] - base[i, 1] if played else 10.0,
+            'RP': 1.5 if played else 0, 'rank': i + 1 if played else 0, 'rank_percentile': 0.5,
+            'record': {'wins': 2, 'losses': 2, 'ties': 0} if played else None,
+            'matches_played': 4 if played else 0, 'score_avg': 320.0 if played else 0,
+            'win_rate': 0.5, 'avg_auto': 10.0, 'avg_barge': 6.0, 'historical_score': 50.0,
+        }
+        power_rankings.append((team, 50.0, stats))
+    return WhatIfEngine(power_rankings, matches, 8, None)
+
+def assert_matches_full_solve(rankings, matches):
+    expected, played = full_solve(matches)
+    expected[~played] = [30.0, 20.0]  # Teams still without matches keep their historical defaults
+    stats_by_team = {team: stats for team, _, stats in rankings}
+    for i, team in enumerate(TEAMS):
+        np.testing.assert_allclose([stats_by_team[team]['OPR'], stats_by_team[team]['DPR']], expected[i], atol=1e-9)
+
+def test_edited_match_matches_full_solve():
+    matches = event_matches()
+    rankings = build_engine(matches).query([{'match': 'qm5', 'red_score': 150, 'blue_score': 20}])
+    edited = copy.deepcopy(matches)
+    edited[4]['alliances']['red']['score'], edited[4]['alliances']['blue']['score'] = 150, 20
+    assert_matches_full_solve(rankings, edited)
+
+def test_new_match_matches_full_solve():
+    matches = event_matches()
+    rankings = build_engine(matches).query([{'match': 'qm13', 'red_score': 90, 'blue_score': 70}])
+    played = copy.deepcopy(matches)
+    played[12] = qual_match(13, [1, 2, 3], [4, 5, 6], 90, 70)
+    assert_matches_full_solve(rankings, played)
+
+def test_unplayed_team_replaces_its_default():
+    matches = event_matches()
+    rankings = build_engine(matches).query([{'match': 'qm14', 'red_score': 100, 'blue_score': 60}])
+    played = copy.deepcopy(matches)
+    played[13] = qual_match(14, [9, 7, 8], [1, 4, 5], 100, 60)
+    assert_matches_full_solve(rankings, played)
+
+    # Team 9 joins the standings, so every percentile uses the larger table
+    for _, _, stats in rankings:
+        assert stats['rank'] > 0
+        assert stats['rank_percentile'] == 1.0 - (stats['rank'] - 1) / 8
@@ -0,0 +1,261 @@
+import time
+
+import numpy as np
+
+from power_rankings import (EVENT_STATE_CACHE, EVENT_KEY, OPR_RIDGE, calc_ranking_score, build_match_design,
+                            generate_power_rankings, parse_barge_points)
+
+# 🔹 Ranking points for a qualification result (used to re-rank the standings)
+WIN_RP = 3
+TIE_RP = 1
+
+# 🔹 Ranking points earned for one alliance's score vs its opponent's
+def result_rp(score, opp_score):
+    if score > opp_score:
+        return WIN_RP
+    return TIE_RP if score == opp_score else 0
+
+# 🔹 What-if engine over cached event state
+# Hypotheticals are applied as deltas on top of the real rankings: accumulators and records are
+# adjusted per team, and OPR/DPR shifts come from low-rank updates to the cached least-squares solve.
+class WhatIfEngine:
+    def __init__(self, power_rankings, matches, team_count, breakdown_fields):
+        self.power_rankings = power_rankings
+        self.team_count = team_count
+        self.auto_field, self.barge_field = breakdown_fields or ("autoPoints", "endGameBargePoints")
+        self.teams = [team for team, _, _ in power_rankings]
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.matches = {match['key'].split('_')[-1]: match for match in matches
+                        if match.get('comp_level') == 'qm'}
+
+        # Cache the inverse normal matrix and right-hand sides of the OPR/DPR least-squares solve
+        design = build_match_design(matches, self.teams, breakdown_fields)
+        A = design['A']
+        self.normal_inv = np.linalg.inv(A.T @ A + OPR_RIDGE * np.eye(len(self.teams)))
+        self.rhs = np.stack([A.T @ design['score'], A.T @ design['opp_score']], axis=1)
+        self.base_solution = self.normal_inv @ self.rhs
+        self.base_played = A.sum(axis=0) > 0  # Teams whose OPR/DPR come from this event, not history
+
+        # Standings order, used to break ranking-point ties when re-ranking
+        self.base_rank = np.array([stats['rank'] if stats['rank'] > 0 else 999
+                                   for _, _, stats in power_rankings], dtype=float)
+
+    # 🔹 Build an engine from the last generate_power_rankings run
+    @classmethod
+    def from_cache(cls):
+        if not EVENT_STATE_CACHE:
+            raise RuntimeError("No cached event state. Run generate_power_rankings(cache_state=True) first.")
+        return cls(EVENT_STATE_CACHE['power_rankings'], EVENT_STATE_CACHE['matches'],
+                   EVENT_STATE_CACHE['team_count'], EVENT_STATE_CACHE['breakdown_fields'])
+
+    def alliance_vector(self, team_keys):
+        row = np.zeros(len(self.teams))
+        for team_key in team_keys:
+            if team_key[3:] in self.team_index:
+                row[self.team_index[team_key[3:]]] = 1
+        return row
+
+    # 🔹 Turn a hypothetical into red/blue scores
+    # Accepts explicit scores ({'match': 'qm72', 'red_score': 120, 'blue_score': 90}) or a
+    # winner and margin ({'match': 'qm72', 'winner': 'red', 'margin': 30}), in which case the
+    # total is taken from the alliances' current OPR sums.
+    def resolve_scores(self, hypothetical, match, stats_by_team):
+        if 'red_score' in hypothetical and 'blue_score' in hypothetical:
+            return float(hypothetical['red_score']), float(hypothetical['blue_score'])
+        if hypothetical.get('winner') not in ['red', 'blue']:
+            raise ValueError(f"Hypothetical for {hypothetical['match']} needs red_score/blue_score or "
+                             f"winner ('red' or 'blue') and margin")
+
+        predicted = {color: sum(stats_by_team[t[3:]]['OPR'] for t in match['alliances'][color]['team_keys']
+                                if t[3:] in stats_by_team)
+                     for color in ['red', 'blue']}
+        midpoint = (predicted['red'] + predicted['blue']) / 2
+        margin = float(hypothetical.get('margin', 0))
+        if hypothetical['winner'] == 'blue':
+            margin = -margin
+        return midpoint + margin / 2, midpoint - margin / 2
+
+    # 🔹 Apply hypothetical results and return the new power rankings
+    def query(self, hypotheticals):
+        stats_by_team = {team: dict(stats) for team, _, stats in self.power_rankings}
+        for stats in stats_by_team.values():
+            stats['record'] = dict(stats.get('record') or {"wins": 0, "losses": 0, "ties": 0})
+        normal_inv = self.normal_inv
+        rhs = self.rhs.copy()
+        played = self.base_played.copy()
+        overrides = {}  # Match key -> scores already applied in this query
+
+        for hypothetical in hypotheticals:
+            match_key = hypothetical['match'].split('_')[-1]
+            match = self.matches.get(match_key)
+            if match is None:
+                raise KeyError(f"Unknown qualification match {hypothetical['match']}")
+
+            red_score, blue_score = self.resolve_scores(hypothetical, match, stats_by_team)
+            vectors = {'red': self.alliance_vector(match['alliances']['red']['team_keys']),
+                       'blue': self.alliance_vector(match['alliances']['blue']['team_keys'])}
+            new = {'red': (red_score, blue_score), 'blue': (blue_score, red_score)}
+
+            # Previous result: an earlier hypothetical, a played match, or none
+            breakdown = match.get('score_breakdown') or {}
+            if match_key in overrides:
+                old = overrides[match_key]
+            elif breakdown:
+                red_old, blue_old = match['alliances']['red']['score'], match['alliances']['blue']['score']
+                old = {'red': (red_old, blue_old, breakdown.get('red', {}).get(self.auto_field, 0),
+                               parse_barge_points(breakdown.get('red', {}).get(self.barge_field, 0))),
+                       'blue': (blue_old, red_old, breakdown.get('blue', {}).get(self.auto_field, 0),
+                                parse_barge_points(breakdown.get('blue', {}).get(self.barge_field, 0)))}
+            else:
+                old = None
+
+            if old is None:
+                # New match: rank-2 Woodbury update of the inverse normal matrix
+                U = np.stack([vectors['red'], vectors['blue']], axis=1)
+                inv_U = normal_inv @ U
+                normal_inv = normal_inv - inv_U @ np.linalg.solve(np.eye(2) + U.T @ inv_U, inv_U.T)
+                played |= (vectors['red'] + vectors['blue']) > 0
+            else:
+                # Edited match: the normal matrix is unchanged, remove the old scores from the right-hand side
+                for color in ['red', 'blue']:
+                    rhs -= np.outer(vectors[color], old[color][:2])
+            for color in ['red', 'blue']:
+                rhs += np.outer(vectors[color], new[color])
+
+            # Per-team accumulators, records and ranking points
+            applied = {}
+            for color in ['red', 'blue']:
+                score, opp_score = new[color]
+                auto = hypothetical.get(f'{color}_auto')
+                barge = hypothetical.get(f'{color}_barge')
+                applied[color] = (score, opp_score,
+                                  auto if auto is not None else (old[color][2] if old else None),
+                                  barge if barge is not None else (old[color][3] if old else None))
+
+                for team_key in match['alliances'][color]['team_keys']:
+                    stats = stats_by_team.get(team_key[3:])
+                    if stats is None:
+                        continue
+                    self.update_team(stats, old[color] if old else None, applied[color])
+            overrides[match_key] = applied
+
+        # Shift OPR/DPR/CCWM by how much the least-squares solution moved; teams playing their first
+        # match replace the historical defaults with the solved values (as in run_bootstrap_batch)
+        solution = normal_inv @ rhs
+        shift = solution - self.base_solution
+        for team, i in self.team_index.items():
+            stats = stats_by_team[team]
+            if self.base_played[i]:
+                stats['OPR'] += shift[i, 0]
+                stats['DPR'] += shift[i, 1]
+                stats['CCWM'] += shift[i, 0] - shift[i, 1]
+            elif played[i]:
+                stats['OPR'] = solution[i, 0]
+                stats['DPR'] = solution[i, 1]
+                stats['CCWM'] = solution[i, 0] - solution[i, 1]
+
+        self.rerank(stats_by_team)
+        return self.score(stats_by_team)
+
+    # 🔹 Move one team's accumulators from an old alliance result to a new one
+    def update_team(self, stats, old, new):
+        score, opp_score, auto, barge = new
+        record = stats['record']
+        outcome = {WIN_RP: 'wins', TIE_RP: 'ties', 0: 'losses'}
+        played_before = record['wins'] + record['losses'] + record['ties']
+        rp_total = stats['RP'] * played_before
+
+        if old is None:
+            matches = stats['matches_played'] + 1
+            stats['matches_played'] = matches
+            stats['score_avg'] += score
+            # Unknown auto/barge for a new match leaves the team's average unchanged
+            if auto is not None:
+                stats['avg_auto'] += (auto - stats['avg_auto']) / matches
+            if barge is not None:
+                stats['avg_barge'] += (barge - stats['avg_barge']) / matches
+        else:
+            old_score, old_opp, old_auto, old_barge = old
+            matches = max(stats['matches_played'], 1)
+            stats['score_avg'] += score - old_score
+            if auto is not None and old_auto is not None:
+                stats['avg_auto'] += (auto - old_auto) / matches
+            if barge is not None and old_barge is not None:
+                stats['avg_barge'] += (barge - old_barge) / matches
+            old_rp = result_rp(old_score, old_opp)
+            record[outcome[old_rp]] -= 1
+            rp_total -= old_rp
+
+        new_rp = result_rp(score, opp_score)
+        record[outcome[new_rp]] += 1
+        played = record['wins'] + record['losses'] + record['ties']
+        stats['RP'] = (rp_total + new_rp) / max(played, 1)
+        stats['win_rate'] = (record['wins'] + 0.5 * record['ties']) / max(played, 1)
+        stats['what_if_affected'] = True
+
+    # 🔹 Re-rank the standings by ranking points and refresh the percentiles
+    def rerank(self, stats_by_team):
+        if not any(stats.get('what_if_affected') for stats in stats_by_team.values()):
+            return
+        # Unranked teams join the standings once a hypothetical gives them a result
+        ranked = [team for team in self.teams
+                  if stats_by_team[team]['rank'] > 0 or stats_by_team[team].get('what_if_affected')]
+        ranked.sort(key=lambda t: (-stats_by_team[t]['RP'], self.base_rank[self.team_index[t]]))
+        team_count = max(self.team_count, len(ranked))
+        for rank, team in enumerate(ranked, 1):
+            stats = stats_by_team[team]
+            # A grown standings table changes every percentile, not just the moved ranks
+            if stats['rank'] != rank or team_count != self.team_count:
+                stats['rank'] = rank
+                stats['rank_percentile'] = 1.0 - ((rank - 1) / max(team_count - 1, 1))
+
+    # 🔹 Score every team with the ensemble formula in one vectorized call
+    def score(self, stats_by_team):
+        stats_list = [stats_by_team[team] for team in self.teams]
+        column = lambda key, default=0: np.array([s.get(key, default) for s in stats_list], dtype=float)
+        matches_played = column('matches_played')
+        scores = calc_ranking_score(
+            column('OPR'), column('DPR'), column('CCWM'),
+            column('score_avg') / np.maximum(matches_played, 1), column('rank_percentile', 0.5),
+            column('win_rate', 0.5), column('avg_auto'), column('avg_barge'),
+            matches_played, column('historical_score')
+        )
+        power_rankings = [(team, float(score), stats) for team, score, stats in zip(self.teams, scores, stats_list)]
+        power_rankings.sort(key=lambda x: x[1], reverse=True)
+        return power_rankings
+
+# 🔹 Parse "qm72 red 30" or "qm72 120 90" into a hypothetical
+def parse_hypothetical(text):
+    parts = text.split()
+    if len(parts) != 3:
+        raise ValueError(f"Expected '<match> red|blue <margin>' or '<match> <red score> <blue score>', got '{text}'")
+    if parts[1] in ['red', 'blue']:
+        return {'match': parts[0], 'winner': parts[1], 'margin': float(parts[2])}
+    return {'match': parts[0], 'red_score': float(parts[1]), 'blue_score': float(parts[2])}
+
+# 🔹 Interactive what-if prompt
+if __name__ == "__main__":
+    print(f"🚀 Loading {EVENT_KEY} once, then answering what-if queries offline...")
+    base_rankings = generate_power_rankings(cache_state=True)
+    engine = WhatIfEngine.from_cache()
+    base_position = {team: rank for rank, (team, _, _) in enumerate(base_rankings, 1)}
+
+    print("\n💡 Enter results like 'qm72 red 30' or 'qm72 120 90'; separate several with commas. Blank line quits.")
+    while True:
+        line = input("what-if> ").strip()
+        if not line:
+            break
+        try:
+            hypotheticals = [parse_hypothetical(part) for part in line.split(',')]
+            start = time.perf_counter()
+            rankings = engine.query(hypotheticals)
+            elapsed = (time.perf_counter() - start) * 1000
+        except (KeyError, ValueError) as e:
+            print(f"⚠️ {e}")
+            continue
+
+        print(f"\n🏆 WHAT-IF POWER RANKINGS ({elapsed:.1f} ms) 🏆")
+        for rank, (team, score, stats) in enumerate(rankings[:24], 1):
+            moved = base_position[team] - rank
+            change = f" ({moved:+d})" if moved else ""
+            print(f"{rank}. Team {team}{change} → Score: {score:.2f} | OPR: {stats['OPR']:.1f} | Rank: {stats['rank']}")